@@ -1,9 +1,11 @@
 """Assistant communication endpoints."""
 
-from typing import List
+import hashlib
+import re
+from typing import List, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 
 from app.api import deps
 from app.schemas.assistant_communication import (
@@ -23,6 +25,31 @@ from app.services.assistant_communication import AssistantCommunicationService
 
 router = APIRouter()
 
+# An entity-tag in an If-None-Match list, optionally weak; group 1 is the
+# quoted opaque tag
+ENTITY_TAG_RE = re.compile(r'(?:W/)?("[^"]*")')
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag.
+
+    Uses the weak comparison RFC 9110 requires for If-None-Match, so weak
+    and strong tags with the same opaque value match.
+
+    Args:
+        if_none_match: Value of the If-None-Match header, if sent
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the header is "*" or lists a tag matching the ETag
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = ENTITY_TAG_RE.match(etag).group(1)
+    return opaque_tag in ENTITY_TAG_RE.findall(if_none_match)
+
 
 async def get_assistant_service(
     assistant_id: str, current_user: User
@@ -147,6 +174,8 @@ async def list_messages(
     thread_id: str,
     assistant_id: str,
     current_user: User = Depends(deps.get_current_user),
+    limit: Optional[int] = Query(None, gt=0, le=100),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$"),
 ) -> List[Message]:
     """List messages in a thread.
 
@@ -154,13 +183,15 @@ async def list_messages(
         thread_id: Thread ID
         assistant_id: Assistant ID
         current_user: Current user
+        limit: Optional maximum number of messages to return
+        order: Optional sort order by creation time ("asc" or "desc")
 
     Returns:
         List of messages
     """
     # Get service with assistant-specific API key
     service = await get_assistant_service(assistant_id, current_user)
-    messages = service.get_messages(thread_id=thread_id)
+    messages = service.get_messages(thread_id=thread_id, limit=limit, order=order)
     return [Message(**msg) for msg in messages]
 
 
@@ -195,23 +226,40 @@ async def get_run_status(
     thread_id: str,
     run_id: str,
     assistant_id: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(deps.get_current_user),
-) -> Run:
+) -> Union[Run, Response]:
     """Get the status of a run.
 
+    The response carries an ETag so pollers can send If-None-Match and get
+    an empty 304 while the run hasn't changed. The run is still fetched to
+    compute the ETag, so a 304 only saves the response body, not the lookup
+    or its latency.
+
     Args:
         thread_id: Thread ID
         run_id: Run ID
         assistant_id: Assistant ID
+        request: Incoming request
+        response: Outgoing response
         current_user: Current user
 
     Returns:
-        Run status
+        Run status, or a 304 response if it matches the client's ETag
     """
     # Get service with assistant-specific API key
     service = await get_assistant_service(assistant_id, current_user)
-    run = service.get_run(thread_id=thread_id, run_id=run_id)
-    return Run(**run)
+    run = Run(**service.get_run(thread_id=thread_id, run_id=run_id))
+
+    digest = hashlib.blake2b(run.model_dump_json().encode(), digest_size=16)
+    etag = f'"{digest.hexdigest()}"'
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
+    return run
 
 
 @router.post("/threads/{thread_id}/runs/{run_id}/submit", response_model=Run)
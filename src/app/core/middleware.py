@@ -0,0 +1,54 @@
+"""HTTP middleware for the application.
+
+This module adapts Starlette middleware to the API's streaming endpoints.
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Media types sent as produced; compressing them would hold events back
+UNCOMPRESSED_MEDIA_TYPES = frozenset({"text/event-stream"})
+
+
+class StreamingGZipResponder(GZipResponder):
+    """GZip responder that passes event streams through untouched."""
+
+    passthrough = False
+
+    async def send_with_gzip(self, message: Message) -> None:
+        """Send a response message, compressing it unless it is a stream.
+
+        Args:
+            message: ASGI response message
+        """
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            media_type = content_type.split(";", 1)[0].strip().lower()
+            self.passthrough = media_type in UNCOMPRESSED_MEDIA_TYPES
+        if self.passthrough:
+            await self.send(message)
+            return
+        await super().send_with_gzip(message)
+
+
+class StreamingGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips compression for server-sent events."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle a request, compressing the response where it's accepted.
+
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "gzip" in headers.get("Accept-Encoding", ""):
+                responder = StreamingGZipResponder(
+                    self.app, self.minimum_size, compresslevel=self.compresslevel
+                )
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
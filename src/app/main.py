@@ -7,9 +7,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.models import SecurityScheme
 from fastapi.security import OAuth2PasswordBearer
 
-from app.core.settings import settings
+from app.core.config import get_settings
+from app.core.middleware import StreamingGZipMiddleware
 from app.api.v1.api import api_router
 
+settings = get_settings()
+
+
 def create_application() -> FastAPI:
     """Create and configure the FastAPI application."""
     app = FastAPI(
@@ -28,6 +32,10 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Compress large JSON responses (in practice message lists) for clients
+    # that send Accept-Encoding: gzip; event streams are sent uncompressed
+    app.add_middleware(StreamingGZipMiddleware, minimum_size=1000)
+
     # Include API router
     app.include_router(api_router, prefix=settings.API_V1_STR)
 
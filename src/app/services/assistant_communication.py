@@ -257,30 +257,45 @@ class AssistantCommunicationService:
         run = self.client.beta.threads.runs.retrieve(thread_id=thread_id, run_id=run_id)
         return run.model_dump()
 
-    def get_messages(self, thread_id: str) -> List[Dict[str, Any]]:
-        """Get all messages in a thread.
+    def get_messages(
+        self,
+        thread_id: str,
+        limit: Optional[int] = None,
+        order: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get messages in a thread.
 
         Args:
             thread_id: Thread ID
+            limit: Optional maximum number of messages to return
+            order: Optional sort order by creation time ("asc" or "desc")
 
         Returns:
             List of messages
         """
-        messages = self.client.beta.threads.messages.list(thread_id=thread_id)
+        list_params: Dict[str, Any] = {}
+        if limit is not None:
+            list_params["limit"] = limit
+        if order is not None:
+            list_params["order"] = order
+        messages = self.client.beta.threads.messages.list(
+            thread_id=thread_id, **list_params
+        )
 
-        # For each message from OpenAI, ensure it's saved in our database
-        for message in messages.data:
-            msg_data = message.model_dump()
-            # Find the session for this thread
-            session_result = (
-                self.supabase.table("lacl_chat_sessions")
-                .select("*")
-                .eq("metadata->>thread_id", thread_id)
-                .execute()
-            )
+        message_list = [message.model_dump() for message in messages.data]
 
-            if session_result.data:
-                session = session_result.data[0]
+        # Find the session for this thread once, not once per message
+        session_result = (
+            self.supabase.table("lacl_chat_sessions")
+            .select("*")
+            .eq("metadata->>thread_id", thread_id)
+            .execute()
+        )
+
+        # For each message from OpenAI, ensure it's saved in our database
+        if session_result.data:
+            session = session_result.data[0]
+            for msg_data in message_list:
                 # Check if message exists
                 msg_result = (
                     self.supabase.table("lacl_chat_messages")
@@ -304,7 +319,7 @@ class AssistantCommunicationService:
                         tokens_used=0,  # We could calculate this if needed
                     )
 
-        return [message.model_dump() for message in messages.data]
+        return message_list
 
     def submit_tool_outputs(
         self, thread_id: str, run_id: str, tool_outputs: List[Dict[str, str]]
@@ -214,6 +214,7 @@ class AssistantStreamingService:
             yield self._create_sse_event("thread.created", thread_data)
 
             # Save to database if assistant_id is provided
+            session = None
             if assistant_id:
                 session = self._get_or_create_chat_session(
                     thread_id=thread.id,  # Use thread.id directly
@@ -229,13 +230,16 @@ class AssistantStreamingService:
                         metadata={"message_id": msg.get("id")}
                     )
 
-            # Create and stream run
+            # Create and stream run; the thread is brand new, so reuse its
+            # session and skip the check for runs already in progress
             async for event in self.stream_run(
                 thread.id,
                 assistant_id=assistant_id,
                 fingerprint=fingerprint,
                 instructions=instructions,
-                tools=tools
+                tools=tools,
+                session=session,
+                check_active_runs=False,
             ):
                 yield event
 
@@ -250,6 +254,8 @@ class AssistantStreamingService:
         fingerprint: str = "default",
         instructions: Optional[str] = None,
         tools: Optional[list] = None,
+        session: Optional[Dict[str, Any]] = None,
+        check_active_runs: bool = True,
     ) -> AsyncGenerator[ServerSentEvent, None]:
         """Stream a run.
 
@@ -259,6 +265,9 @@ class AssistantStreamingService:
             fingerprint: User fingerprint for database
             instructions: Optional override instructions
             tools: Optional tools to use
+            session: Chat session already fetched for the thread, if any
+            check_active_runs: Whether to wait for runs already in progress
+                on the thread first; threads created just now have none
 
         Yields:
             Server-sent events for the run
@@ -271,8 +280,7 @@ class AssistantStreamingService:
                 raise ValueError("OpenAI Assistant ID is required")
 
             # Get or create session if assistant_id is provided
-            session = None
-            if assistant_id:
+            if session is None and assistant_id:
                 session = self._get_or_create_chat_session(
                     thread_id=thread_id,
                     assistant_id=assistant_id,
@@ -280,11 +288,17 @@ class AssistantStreamingService:
                 )
 
             # Check for active runs
-            runs = self.client.beta.threads.runs.list(thread_id=thread_id)
-            active_run = next(
-                (run for run in runs.data if run.status in ["queued", "in_progress"]),
-                None,
-            )
+            active_run = None
+            if check_active_runs:
+                runs = self.client.beta.threads.runs.list(thread_id=thread_id)
+                active_run = next(
+                    (
+                        run
+                        for run in runs.data
+                        if run.status in ["queued", "in_progress"]
+                    ),
+                    None,
+                )
 
             if active_run:
                 # Wait for the active run to complete
@@ -1,14 +0,0 @@
-"""
-Basic health check endpoint tests.
-"""
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-client = TestClient(app)
-
-def test_health_check():
-    """Test the health check endpoint."""
-    response = client.get("/health")
-    assert response.status_code == 200
-    assert response.json() == {"status": "healthy"} 
\ No newline at end of file
@@ -1,12 +1,21 @@
 """
 Pytest configuration file.
 """
+
+from typing import Iterator
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
 
-@pytest.fixture
-def client() -> TestClient:
-    """Create a test client for the FastAPI application."""
-    return TestClient(app)
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    """Create a test client for the FastAPI application.
+
+    The client holds no per-test state, so one instance is shared by the
+    whole session and closed at the end.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
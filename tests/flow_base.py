@@ -0,0 +1,325 @@
+"""Shared HTTP plumbing for the LOACL end-to-end test flows.
+
+Provides the JSON helpers, the pooled requests session setup and the
+request/registration/login steps used by every test flow script.
+"""
+
+import json
+import logging
+import sys
+import threading
+import uuid
+from typing import Any, ClassVar, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+if orjson is not None:
+
+    def dump_json(data: Any) -> bytes:
+        """Serialize data to compact JSON bytes."""
+        return orjson.dumps(data)
+
+    def format_json(data: Any) -> str:
+        """Pretty-print data as JSON for logging."""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+    load_json = orjson.loads
+
+else:
+
+    def dump_json(data: Any) -> bytes:
+        """Serialize data to compact JSON bytes."""
+        return json.dumps(data, separators=(",", ":")).encode()
+
+    def format_json(data: Any) -> str:
+        """Pretty-print data as JSON for logging."""
+        return json.dumps(data, indent=2)
+
+    load_json = json.loads
+
+# Headers for requests whose body is pre-serialized with dump_json
+JSON_HEADERS: Dict[str, Optional[str]] = {"Content-Type": "application/json"}
+
+# Headers for the OAuth2 password-flow login form
+FORM_HEADERS: Dict[str, str] = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Upper bound on concurrent in-flight requests per flow
+MAX_CONCURRENT_REQUESTS = 8
+
+# (connect, read) timeout applied to every request that doesn't set its own
+DEFAULT_TIMEOUT = (5, 30)
+
+
+# Loggers raised to DEBUG when verbose: the flow script being run and this
+# module; library loggers such as urllib3's stay at INFO
+FLOW_LOGGERS = ("__main__", __name__)
+
+
+def configure_logging(verbose: bool = False) -> None:
+    """Send flow output to stdout, including request payloads when verbose.
+
+    Args:
+        verbose: Whether to enable DEBUG level logging for the flow loggers
+    """
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    if verbose:
+        for name in FLOW_LOGGERS:
+            logging.getLogger(name).setLevel(logging.DEBUG)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTP adapter that applies a default timeout to every request."""
+
+    def send(self, request, **kwargs):  # type: ignore[no-untyped-def]
+        """Send the request, falling back to the default timeout."""
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = DEFAULT_TIMEOUT
+        return super().send(request, **kwargs)
+
+
+class BaseTestFlow:
+    """Base class for the end-to-end test flows.
+
+    Subclasses set the test user's email prefix and password.
+    """
+
+    EMAIL_PREFIX: ClassVar[str] = "loacl"
+    TEST_PASSWORD: ClassVar[str] = "uraan123"
+
+    def __init__(self, base_url: str, user_seed: Optional[str] = None):
+        """Initialize the test flow.
+
+        Args:
+            base_url: Base URL of the API
+            user_seed: Fixed ID for the test user, so repeated runs (e.g. one
+                CI job) reuse a single account instead of registering a new
+                one each time
+        """
+        logger.info("\nInitializing with:")
+        logger.info("Base URL: %s", base_url)
+
+        self.base_url = base_url.rstrip("/")
+        self.access_token: Optional[str] = None
+        self.api_key: Optional[str] = None
+
+        # Reuse pooled connections across calls; polling issues bursts of
+        # GETs, so retry throttling and transient gateway errors on them
+        # (waiting as long as Retry-After asks) and never let a stalled
+        # server hang the flow
+        self.session = requests.Session()
+        adapter = TimeoutHTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.1,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=["GET"],
+                respect_retry_after_header=True,
+                # Hand back the last throttled/5xx response so it is logged
+                # by _handle_error like any other HTTP error
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Every endpoint answers JSON; ask for compressed bodies explicitly
+        # (brotli is left out since urllib3 only decodes it with brotli
+        # installed)
+        self.session.headers.update(
+            {"Accept": "application/json", "Accept-Encoding": "gzip, deflate"}
+        )
+        self._request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        # (ETag, parsed body) of the last response per GET URL, so repeated
+        # polls can be answered with an empty 304 Not Modified
+        self._etags: Dict[str, Tuple[str, Any]] = {}
+
+        # Without a seed, generate a random ID for the test user, wide enough
+        # that repeated CI runs don't collide on an already registered email
+        self.user_seed = user_seed
+        self.random_id = user_seed or uuid.uuid4().hex[:12]
+        self.test_email = f"ashaheen+{self.EMAIL_PREFIX}+{self.random_id}@workhub.ai"
+        self.test_password = self.TEST_PASSWORD
+
+    def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        use_api_key: bool = False,
+        parse: bool = True,
+        raw_body: Optional[bytes] = None,
+    ) -> Any:
+        """Make an HTTP request to the API.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint
+            data: Request data
+            params: Query parameters
+            use_api_key: Whether to use API key instead of Bearer token
+            parse: Whether to decode the response body; callers that ignore
+                the result pass False to skip the JSON parse
+            raw_body: Pre-serialized JSON body, sent as-is instead of data
+
+        Returns:
+            API response as dictionary, or None when parse is False
+        """
+        # base_url has no trailing slash and every endpoint starts with "/"
+        url = f"{self.base_url}{endpoint}"
+        headers: Optional[Dict[str, Optional[str]]] = None
+
+        # Use API key if specified and available; a None value drops the
+        # session's Bearer token so only the API key authenticates the call
+        if use_api_key and self.api_key:
+            headers = {"X-API-Key": self.api_key, "Authorization": None}
+
+        body = raw_body
+        if body is None and data and method != "GET":
+            if logger.isEnabledFor(logging.DEBUG):
+                # Sanitize data for logging, copying only when there's a secret
+                log_data = {**data, "api_key": "***"} if "api_key" in data else data
+                logger.debug("Request data: %s", format_json(log_data))
+
+            body = dump_json(data)
+        if body is not None:
+            headers = {**headers, **JSON_HEADERS} if headers else JSON_HEADERS
+
+        cache_key: Optional[str] = None
+        if method == "GET" and parse:
+            cache_key = f"{url}?{urlencode(params)}" if params else url
+            cached = self._etags.get(cache_key)
+            if cached:
+                headers = {**(headers or {}), "If-None-Match": cached[0]}
+
+        # Bound the number of in-flight requests when steps run concurrently
+        with self._request_slots:
+            response = self.session.request(
+                method, url, data=body, headers=headers, params=params
+            )
+
+        logger.debug(
+            "%s %s -> %s (%s)",
+            method,
+            endpoint,
+            response.status_code,
+            response.headers.get("Content-Encoding", "identity"),
+        )
+        if response.status_code >= 400:
+            self._handle_error(method, endpoint, response)
+        if not parse:
+            return None
+        if response.status_code == 304 and cache_key:
+            return self._etags[cache_key][1]
+        result = load_json(response.content) if response.content else {}
+        etag = response.headers.get("ETag")
+        if etag and cache_key:
+            self._etags[cache_key] = (etag, result)
+        return result
+
+    @staticmethod
+    def _handle_error(method: str, endpoint: str, response: requests.Response) -> None:
+        """Log a failed response in detail and raise its HTTPError.
+
+        Args:
+            method: HTTP method of the failed request
+            endpoint: API endpoint of the failed request
+            response: The error response
+
+        Raises:
+            requests.exceptions.HTTPError: Always
+        """
+        logger.error("\nError in %s %s:", method, endpoint)
+        logger.error("Status code: %s", response.status_code)
+
+        # Try to parse and format error response
+        try:
+            error_data = load_json(response.content)
+            if isinstance(error_data, dict):
+                if "error" in error_data and isinstance(error_data["error"], dict):
+                    # OpenAI style errors
+                    error_type = error_data["error"].get("type", "unknown")
+                    error_msg = error_data["error"].get("message", "No message")
+                    logger.error("Error type: %s", error_type)
+                    logger.error("Error message: %s", error_msg)
+                elif "detail" in error_data:
+                    # FastAPI style errors
+                    logger.error("Error details: %s", format_json(error_data["detail"]))
+                else:
+                    logger.error("Error response: %s", format_json(error_data))
+            else:
+                logger.error("Error response: %s", format_json(error_data))
+        except ValueError:
+            logger.error("Raw error response: %s", response.text)
+
+        response.raise_for_status()
+
+    def register_user(self) -> Dict[str, Any]:
+        """Register a new test user.
+
+        Returns:
+            Registration response
+        """
+        logger.info("\n1. Registering user...")
+        data = {
+            "email": self.test_email,
+            "password": self.test_password,
+            "password_confirm": self.test_password,
+            "full_name": "Test User",
+        }
+        return self._make_request("POST", "/api/v1/auth/register", data)
+
+    def login_user(self) -> Dict[str, Any]:
+        """Log in the test user.
+
+        Returns:
+            Login response with access token
+        """
+        logger.info("\n2. Logging in user...")
+        # Send as form data instead of JSON, encoded up front so requests
+        # sends the bytes as-is (it sets Content-Length for them)
+        body = urlencode(
+            {
+                "grant_type": "password",  # Required for OAuth2 password flow
+                "username": self.test_email,
+                "password": self.test_password,
+            }
+        ).encode()
+        response = self.session.post(
+            f"{self.base_url}/api/v1/auth/login/access-token",
+            data=body,
+            headers=FORM_HEADERS,
+        )
+        response.raise_for_status()
+        response_data = load_json(response.content)
+        self.access_token = response_data["access_token"]
+        self.session.headers["Authorization"] = f"Bearer {self.access_token}"
+        return response_data
+
+    def sign_in(self) -> None:
+        """Authenticate the test user, registering it only when needed.
+
+        A seeded user usually exists from an earlier run, so logging in is
+        tried first and registration only happens if that is rejected.
+        """
+        if self.user_seed:
+            try:
+                self.login_user()
+                return
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code != 401:
+                    raise
+                logger.info("Seeded user %s not registered yet", self.test_email)
+        self.register_user()
+        self.login_user()
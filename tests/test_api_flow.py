@@ -8,150 +8,215 @@ This script performs end-to-end testing of the LOACL API, including:
 """
 
 import argparse
+import hashlib
 import json
-import random
+import logging
+import os
 import sys
 import time
-from typing import Any, Dict, List, Optional, Union
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, ClassVar, Dict, List, NamedTuple, Optional, Tuple
 
 import requests
-
-
-class APITestFlow:
+from flow_base import (
+    JSON_HEADERS,
+    BaseTestFlow,
+    configure_logging,
+    dump_json,
+    load_json,
+)
+
+logger = logging.getLogger(__name__)
+
+# Access tokens are cached between runs so the flow can skip register/login
+TOKEN_CACHE_PATH = Path("~/.loacl_test_token.json").expanduser()
+
+# Assistant replies cached by --cache-responses, keyed by assistant and prompt
+RESPONSE_CACHE_DIR = Path(".cache/loacl_responses")
+
+# Run statuses after which the flow stops waiting, whether polling or
+# streaming; requires_action counts since the flow submits no tool outputs
+RUN_TERMINAL_STATUSES = frozenset(
+    {"completed", "failed", "cancelled", "expired", "incomplete", "requires_action"}
+)
+RUN_TERMINAL_EVENTS = frozenset(
+    f"thread.run.{status}" for status in RUN_TERMINAL_STATUSES
+)
+
+# Run-status polling backoff, in seconds
+POLL_INITIAL_DELAY = 0.25
+POLL_BACKOFF_FACTOR = 1.5
+POLL_MAX_DELAY = 4.0
+# Seconds a run may take before polling gives up
+POLL_TIMEOUT = 120.0
+
+
+class Turn(NamedTuple):
+    """A single user turn in the scripted conversation."""
+
+    user: str
+    context: str
+
+
+# Scripted conversation with 5 back-and-forth exchanges
+CONVERSATIONS: Tuple[Turn, ...] = (
+    Turn(
+        user=(
+            "Hello! I'm interested in learning about software testing "
+            "best practices. Can you help me understand the key "
+            "principles?"
+        ),
+        context="Initial question about testing principles",
+    ),
+    Turn(
+        user=(
+            "That's helpful! Could you elaborate specifically on the "
+            "difference between unit tests and integration tests, and "
+            "when to use each?"
+        ),
+        context="Follow-up on test types",
+    ),
+    Turn(
+        user=(
+            "Great explanation! Now, what are some popular Python "
+            "testing frameworks you'd recommend, and what makes them "
+            "stand out?"
+        ),
+        context="Question about testing tools",
+    ),
+    Turn(
+        user=(
+            "I've heard about test-driven development (TDD). Could you "
+            "explain its benefits and potential drawbacks?"
+        ),
+        context="Exploring TDD methodology",
+    ),
+    Turn(
+        user=(
+            "Finally, can you provide some best practices for writing "
+            "maintainable and readable test cases?"
+        ),
+        context="Best practices for test writing",
+    ),
+)
+
+# Message bodies for the scripted turns, serialized once at import
+MESSAGE_PAYLOADS: Dict[str, bytes] = {
+    turn.user: dump_json({"content": turn.user}) for turn in CONVERSATIONS
+}
+
+
+class APITestFlow(BaseTestFlow):
     """Test class for validating the LOACL API flow."""
 
-    def __init__(self, base_url: str, assistant_id: str, openai_key: str):
+    # Constant request payloads, built once and only ever read
+    EMPTY_THREAD: ClassVar[Dict[str, Any]] = {"messages": []}
+    ASSISTANT_SETTINGS: ClassVar[Dict[str, Any]] = {
+        "theme": {
+            "primary_color": "#FF0000",
+            "secondary_color": "#00FF00",
+            "text_color": "#0000FF",
+            "background_color": "#FFFFFF",
+        },
+        "chat_bubble_text": "Chat with me!",
+        "initial_message": "Hello! How can I help you today!",
+    }
+
+    def __init__(
+        self,
+        base_url: str,
+        assistant_id: str,
+        openai_key: str,
+        stream: bool = False,
+        cache_responses: bool = False,
+        user_seed: Optional[str] = None,
+    ):
         """Initialize the test flow.
 
         Args:
             base_url: Base URL of the API
             assistant_id: OpenAI Assistant ID
             openai_key: OpenAI API key
+            stream: Whether to run the assistant over SSE instead of polling
+            cache_responses: Whether to reuse assistant replies cached on disk
+            user_seed: Fixed ID for the test user instead of a random one
         """
-        print("\nInitializing with:")
-        print(f"Base URL: {base_url}")
-        print(f"Assistant ID: {assistant_id}")
+        super().__init__(base_url, user_seed=user_seed)
+        logger.info("Assistant ID: %s", assistant_id)
         # Mask the key
-        print(f"OpenAI Key: {'*' * len(openai_key)}")
+        logger.info("OpenAI Key: %s", "*" * len(openai_key))
 
-        self.base_url = base_url.rstrip("/")
         # OpenAI's assistant ID (asst_*)
         self.openai_assistant_id = assistant_id
         self.openai_key = openai_key
-        self.access_token: Optional[str] = None
         # Local UUID for the assistant
         self.local_assistant_id: Optional[str] = None
         self.thread_id: Optional[str] = None
-        self.headers: Dict[str, str] = {}
+        self.run_data: Dict[str, Any] = {}
+        self.stream = stream
+        self.cache_responses = cache_responses
 
-        # Generate a random ID for the test user
-        self.random_id = random.randint(1000, 9999)
-        self.test_email = f"ashaheen+loacl+{self.random_id}@workhub.ai"
-        self.test_password = "uraan123"
+    def load_cached_token(self) -> bool:
+        """Reuse the access token cached by a previous run, if still valid.
 
-    def _make_request(
-        self,
-        method: str,
-        endpoint: str,
-        data: Optional[Dict[str, Any]] = None,
-        params: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
-        """Make an HTTP request to the API.
-
-        Args:
-            method: HTTP method (GET, POST, etc.)
-            endpoint: API endpoint
-            data: Request data
-            params: Query parameters
+        With a user seed, only a token cached for the seeded email is reused.
 
         Returns:
-            API response as dictionary
+            True if a valid cached token was loaded, False otherwise
         """
-        url = urljoin(self.base_url, endpoint)
-        headers = self.headers.copy()
-
-        if data and method != "GET":
-            # Sanitize data for logging
-            log_data = data.copy()
-            if "api_key" in log_data:
-                log_data["api_key"] = "***"
-            print(f"Request data: {json.dumps(log_data, indent=2)}")
-
-            headers["Content-Type"] = "application/json"
-            response = requests.request(
-                method, url, json=data, headers=headers, params=params
-            )
-        else:
-            response = requests.request(method, url, headers=headers, params=params)
-
         try:
-            response.raise_for_status()
-            return response.json() if response.text else {}
-        except requests.exceptions.HTTPError as e:
-            print(f"\nError in {method} {endpoint}:")
-            print(f"Status code: {response.status_code}")
+            cache = json.loads(TOKEN_CACHE_PATH.read_text())
+            cached = cache[self.base_url]
+            email, token = cached["email"], cached["access_token"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        if self.user_seed and email != self.test_email:
+            # A seeded run must act as its own user, not whoever ran last
+            return False
+
+        # Validate the token with a cheap authenticated request; any failure
+        # is a cache miss and falls back to a fresh sign-in
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/v1/auth/me",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+        except requests.exceptions.RequestException as e:
+            logger.info("\nCould not validate cached access token (%s)", e)
+            return False
+        if response.status_code == 401:
+            logger.info("\nCached access token expired, logging in again...")
+            return False
+        if not response.ok:
+            logger.info(
+                "\nCould not validate cached access token (status %s)",
+                response.status_code,
+            )
+            return False
 
-            # Try to parse and format error response
-            try:
-                error_data = response.json()
-                if isinstance(error_data, dict):
-                    if "error" in error_data and isinstance(error_data["error"], dict):
-                        # OpenAI style errors
-                        error_type = error_data["error"].get("type", "unknown")
-                        error_msg = error_data["error"].get("message", "No message")
-                        print(f"Error type: {error_type}")
-                        print(f"Error message: {error_msg}")
-                    elif "detail" in error_data:
-                        # FastAPI style errors
-                        print(
-                            f"Error details: {json.dumps(error_data['detail'], indent=2)}"
-                        )
-                    else:
-                        print(f"Error response: {json.dumps(error_data, indent=2)}")
-            except json.JSONDecodeError:
-                print(f"Raw error response: {response.text}")
-
-            raise e
-
-    def register_user(self) -> Dict[str, Any]:
-        """Register a new test user.
+        logger.info("\nReusing cached access token for %s", email)
+        self.test_email = email
+        self.access_token = token
+        self.session.headers["Authorization"] = f"Bearer {self.access_token}"
+        return True
 
-        Returns:
-            Registration response
-        """
-        print("\n1. Registering user...")
-        data = {
+    def save_cached_token(self) -> None:
+        """Cache the current access token for subsequent runs."""
+        try:
+            cache = json.loads(TOKEN_CACHE_PATH.read_text())
+        except (OSError, ValueError):
+            cache = {}
+        cache[self.base_url] = {
             "email": self.test_email,
-            "password": self.test_password,
-            "full_name": "Test User",
+            "access_token": self.access_token,
         }
-        return self._make_request("POST", "/api/v1/auth/register", data)
-
-    def login_user(self) -> Dict[str, Any]:
-        """Log in the test user.
-
-        Returns:
-            Login response with access token
-        """
-        print("\n2. Logging in user...")
-        # Send as form data instead of JSON
-        data = {
-            "grant_type": "password",  # Required for OAuth2 password flow
-            "username": self.test_email,
-            "password": self.test_password,
-        }
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        response = requests.post(
-            urljoin(self.base_url, "/api/v1/auth/login/access-token"),
-            data=data,
-            headers=headers,
-        )
-        response.raise_for_status()
-        response_data = response.json()
-        self.access_token = response_data["access_token"]
-        self.headers["Authorization"] = f"Bearer {self.access_token}"
-        return response_data
+        # The cache holds live bearer tokens, so keep it readable by the owner
+        # only; chmod covers files created before the mode was set
+        fd = os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.chmod(TOKEN_CACHE_PATH, 0o600)
 
     def create_assistant(self) -> Dict[str, Any]:
         """Create a new assistant.
@@ -159,7 +224,7 @@ class APITestFlow:
         Returns:
             Assistant creation response
         """
-        print("\n3. Creating assistant...")
+        logger.info("\n3. Creating assistant...")
         # Validate assistant_id format
         if not self.openai_assistant_id.startswith("asst_"):
             raise ValueError(
@@ -167,9 +232,9 @@ class APITestFlow:
                 "but it must start with 'asst_'"
             )
 
-        print(
-            f"Creating assistant with OpenAI Assistant ID: "
-            f"{self.openai_assistant_id}"
+        logger.info(
+            "Creating assistant with OpenAI Assistant ID: %s",
+            self.openai_assistant_id,
         )
         data = {
             "name": "Test Assistant",
@@ -182,28 +247,23 @@ class APITestFlow:
         }
         response = self._make_request("POST", "/api/v1/assistants", data)
         self.local_assistant_id = response["id"]
-        print(f"Created local assistant with ID: {self.local_assistant_id}")
+        # Every run uses the same payload, so build it once per assistant
+        self.run_data = {
+            "assistant_id": self.local_assistant_id,
+            "instructions": None,
+            "tools": [],
+        }
+        logger.info("Created local assistant with ID: %s", self.local_assistant_id)
         return response
 
-    def update_assistant_settings(self) -> Dict[str, Any]:
-        """Update assistant settings.
-
-        Returns:
-            Settings update response
-        """
-        print("\n4. Updating assistant settings...")
-        data = {
-            "theme": {
-                "primary_color": "#FF0000",
-                "secondary_color": "#00FF00",
-                "text_color": "#0000FF",
-                "background_color": "#FFFFFF",
-            },
-            "chat_bubble_text": "Chat with me!",
-            "initial_message": "Hello! How can I help you today!",
-        }
-        return self._make_request(
-            "PUT", f"/api/v1/assistants/{self.local_assistant_id}", data
+    def update_assistant_settings(self) -> None:
+        """Update assistant settings."""
+        logger.info("\n4. Updating assistant settings...")
+        self._make_request(
+            "PUT",
+            f"/api/v1/assistants/{self.local_assistant_id}",
+            self.ASSISTANT_SETTINGS,
+            parse=False,
         )
 
     def get_widget_code(self) -> Dict[str, Any]:
@@ -212,7 +272,7 @@ class APITestFlow:
         Returns:
             Widget code response
         """
-        print("\n5. Getting widget code...")
+        logger.info("\n5. Getting widget code...")
         return self._make_request(
             "GET", f"/api/v1/assistants/{self.local_assistant_id}/embed"
         )
@@ -223,108 +283,239 @@ class APITestFlow:
         Returns:
             Widget settings response
         """
-        print("\n6. Getting widget settings...")
+        logger.info("\n6. Getting widget settings...")
         return self._make_request(
             "GET", f"/api/v1/assistants/{self.local_assistant_id}"
         )
 
-    def get_session_messages(self, session_id: str) -> List[Dict[str, Any]]:
+    def get_session_messages(
+        self, session_id: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """Get messages from a specific chat session.
 
         Args:
             session_id: Chat session ID
+            limit: Maximum number of (most recent) messages to return
 
         Returns:
             List of chat messages
         """
-        print(f"\nGetting messages for session: {session_id}")
+        logger.info("\nGetting messages for session: %s", session_id)
+        params: Dict[str, Any] = {"assistant_id": self.local_assistant_id}
+        if limit is not None:
+            params["limit"] = limit
         return self._make_request(
             "GET",
             f"/api/v1/assistant-communication/chat-sessions/{session_id}/messages",
-            params={"assistant_id": self.local_assistant_id},
+            params=params,
         )
 
-    def get_all_messages(self) -> List[Dict[str, Any]]:
+    def get_all_messages(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get all messages across sessions.
 
+        Args:
+            limit: Maximum number of (most recent) messages to return
+
         Returns:
             List of chat messages
         """
-        print("\nRetrieving all messages across sessions...")
+        logger.info("\nRetrieving all messages across sessions...")
+        params: Dict[str, Any] = {"assistant_id": self.local_assistant_id}
+        if limit is not None:
+            params["limit"] = limit
         return self._make_request(
             "GET",
             "/api/v1/assistant-communication/chat-sessions/messages",
-            params={"assistant_id": self.local_assistant_id},
+            params=params,
+        )
+
+    def _poll_run(self) -> None:
+        """Create a run and poll its status until it finishes.
+
+        Raises:
+            TimeoutError: If the run hasn't finished within POLL_TIMEOUT
+        """
+        logger.info("Creating run with local assistant ID: %s", self.local_assistant_id)
+        run_response = self._make_request(
+            "POST",
+            f"/api/v1/assistant-communication/threads/{self.thread_id}/runs",
+            data=self.run_data,
         )
 
+        # Poll for completion
+        run_id = run_response["id"]
+        logger.info("Waiting for assistant's response...")
+        polls = 0
+        delay = POLL_INITIAL_DELAY
+        deadline = time.monotonic() + POLL_TIMEOUT
+        while True:
+            run_status = self._make_request(
+                "GET",
+                (
+                    f"/api/v1/assistant-communication/threads/"
+                    f"{self.thread_id}/runs/{run_id}"
+                ),
+                params={"assistant_id": self.local_assistant_id},
+            )
+            polls += 1
+            if run_status["status"] in RUN_TERMINAL_STATUSES:
+                break
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(
+                    f"Run {run_id} still {run_status['status']} after "
+                    f"{POLL_TIMEOUT:.0f}s ({polls} status checks)"
+                )
+            # Back off so fast runs are noticed quickly and slow ones
+            # aren't polled needlessly often
+            time.sleep(delay)
+            delay = min(delay * POLL_BACKOFF_FACTOR, POLL_MAX_DELAY)
+        logger.info("Run %s after %d status checks\n", run_status["status"], polls)
+
+    def _stream_run(self) -> Optional[Dict[str, Any]]:
+        """Create a run over SSE and wait for it to finish.
+
+        Returns:
+            The completed assistant message if the stream delivered one,
+            otherwise None
+        """
+        logger.info(
+            "Streaming run with local assistant ID: %s", self.local_assistant_id
+        )
+        response = self.session.post(
+            (
+                f"{self.base_url}/api/v1/assistant-streaming/threads/"
+                f"{self.thread_id}/runs/stream"
+            ),
+            data=dump_json(self.run_data),
+            headers={
+                **JSON_HEADERS,
+                "Accept": "text/event-stream",
+                # The session asks for gzip; a compressed stream would only
+                # be decoded in chunks, so ask for the events as sent
+                "Accept-Encoding": "identity",
+            },
+            stream=True,
+        )
+        response.raise_for_status()
+
+        assistant_message: Optional[Dict[str, Any]] = None
+        event_type = None
+        with response:
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event: "):
+                    event_type = line[7:].strip()
+                    continue
+                if not line.startswith("data: "):
+                    continue
+
+                event_data = load_json(line[6:])
+                if event_type == "thread.message.completed":
+                    # The server streams in-progress snapshots too, so only
+                    # keep assistant messages that are actually complete
+                    if (
+                        event_data.get("role") == "assistant"
+                        and event_data.get("status") == "completed"
+                    ):
+                        assistant_message = event_data
+                elif event_type == "error":
+                    logger.error("\nError: %s", event_data.get("error"))
+                    break
+                elif event_type in RUN_TERMINAL_EVENTS:
+                    break
+        return assistant_message
+
+    def _response_cache_path(self, message: str) -> Path:
+        """Get the cache file for the assistant's reply to a message.
+
+        Args:
+            message: Message content
+
+        Returns:
+            Path of the cache file
+        """
+        # Keys only need to be collision-free, not cryptographic; a 128-bit
+        # blake2b digest is cheaper than sha256 without SHA extensions
+        key = hashlib.blake2b(
+            f"{self.openai_assistant_id}\0{message}".encode(), digest_size=16
+        ).hexdigest()
+        return RESPONSE_CACHE_DIR / f"{key}.json"
+
     def send_message(self, message: str) -> Optional[Dict[str, Any]]:
         """Send a message to the assistant and get the response.
 
+        With response caching enabled, a reply cached by a previous run is
+        returned without contacting the server.
+
+        Args:
+            message: Message content to send
+
+        Returns:
+            Assistant's response message or None if no response
+        """
+        if not self.cache_responses:
+            return self._send_message(message)
+
+        cache_path = self._response_cache_path(message)
+        if cache_path.exists():
+            logger.info("\nUsing cached response for message: %s", message)
+            return load_json(cache_path.read_bytes())
+
+        response = self._send_message(message)
+        if response is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(dump_json(response))
+        return response
+
+    def _send_message(self, message: str) -> Optional[Dict[str, Any]]:
+        """Send a message to the assistant and wait for its reply.
+
         Args:
             message: Message content to send
 
         Returns:
             Assistant's response message or None if no response
         """
-        print(f"\nSending message: {message}")
+        logger.info("\nSending message: %s", message)
         # First create a thread
         if not self.thread_id:
-            thread_data: Dict[str, Any] = {"messages": []}
             thread_response = self._make_request(
                 "POST",
                 "/api/v1/assistant-communication/threads",
-                data=thread_data,
+                data=self.EMPTY_THREAD,
                 params={"assistant_id": self.local_assistant_id},
             )
             self.thread_id = thread_response["id"]
-            print(f"Created new thread with ID: {self.thread_id}")
+            logger.info("Created new thread with ID: %s", self.thread_id)
 
         # Add message to thread
-        message_data = {"content": message}
+        payload = MESSAGE_PAYLOADS.get(message) or dump_json({"content": message})
         message_response = self._make_request(
             "POST",
             f"/api/v1/assistant-communication/threads/{self.thread_id}/messages",
-            data=message_data,
             params={"assistant_id": self.local_assistant_id},
+            raw_body=payload,
         )
-        print("Message sent successfully")
+        logger.info("Message sent successfully")
 
         # Create and monitor run
-        run_data: Dict[str, Any] = {
-            "assistant_id": self.local_assistant_id,
-            "instructions": None,
-            "tools": [],
-        }
-        print(f"Creating run with local assistant ID: {self.local_assistant_id}")
-        run_response = self._make_request(
-            "POST",
-            f"/api/v1/assistant-communication/threads/{self.thread_id}/runs",
-            data=run_data,
-        )
-
-        # Poll for completion
-        run_id = run_response["id"]
-        print("Waiting for assistant's response...")
-        while True:
-            run_status = self._make_request(
-                "GET",
-                (
-                    f"/api/v1/assistant-communication/threads/"
-                    f"{self.thread_id}/runs/{run_id}"
-                ),
-                params={"assistant_id": self.local_assistant_id},
-            )
-            if run_status["status"] in ["completed", "failed"]:
-                break
-            time.sleep(1)
-            print(".", end="", flush=True)
-        print("\n")
+        if self.stream:
+            streamed_message = self._stream_run()
+            if streamed_message is not None:
+                return streamed_message
+            logger.info("No completed message in stream, fetching messages...")
+        else:
+            self._poll_run()
 
-        # Get messages
+        # Once the run is done its reply is the newest message in the thread,
+        # so fetch just that instead of the whole (growing) history
         messages = self._make_request(
             "GET",
             f"/api/v1/assistant-communication/threads/{self.thread_id}/messages",
-            params={"assistant_id": self.local_assistant_id},
+            params={
+                "assistant_id": self.local_assistant_id,
+                "order": "desc",
+                "limit": 1,
+            },
         )
 
         # Return the latest assistant message
@@ -339,23 +530,20 @@ class APITestFlow:
         Args:
             session_id: Chat session ID
         """
-        print(f"\nDeleting chat session: {session_id}")
+        logger.info("\nDeleting chat session: %s", session_id)
         self._make_request(
             "DELETE",
             f"/api/v1/assistant-communication/chat-sessions/{session_id}",
-            params={"assistant_id": self.local_assistant_id}
+            params={"assistant_id": self.local_assistant_id},
+            parse=False,
         )
-        print("Chat session deleted successfully")
+        logger.info("Chat session deleted successfully")
 
-    def delete_assistant(self) -> Dict[str, Any]:
-        """Delete the test assistant.
-
-        Returns:
-            Deletion response
-        """
-        print("\n9. Deleting assistant...")
-        return self._make_request(
-            "DELETE", f"/api/v1/assistants/{self.local_assistant_id}"
+    def delete_assistant(self) -> None:
+        """Delete the test assistant."""
+        logger.info("\n9. Deleting assistant...")
+        self._make_request(
+            "DELETE", f"/api/v1/assistants/{self.local_assistant_id}", parse=False
         )
 
 
@@ -367,71 +555,75 @@ def main() -> None:
     )
     parser.add_argument("--assistant-id", required=True, help="OpenAI Assistant ID")
     parser.add_argument("--openai-key", required=True, help="OpenAI API Key")
+    parser.add_argument(
+        "--no-token-cache",
+        action="store_true",
+        help="Always register a fresh user instead of reusing a cached token",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Log request payloads (DEBUG level)"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Wait for runs over SSE instead of polling the run status",
+    )
+    parser.add_argument(
+        "--cache-responses",
+        action="store_true",
+        help=(
+            "Reuse assistant replies cached on disk by earlier runs; cached "
+            "exchanges are not sent to the server"
+        ),
+    )
+    parser.add_argument(
+        "--user-seed",
+        default=os.environ.get("CI_JOB_ID"),
+        help=(
+            "Fixed ID for the test user so runs reuse one account "
+            "(defaults to $CI_JOB_ID, otherwise a random ID)"
+        ),
+    )
     args = parser.parse_args()
 
-    test_flow = APITestFlow(args.base_url, args.assistant_id, args.openai_key)
+    configure_logging(args.verbose)
+
+    test_flow = APITestFlow(
+        args.base_url,
+        args.assistant_id,
+        args.openai_key,
+        stream=args.stream,
+        cache_responses=args.cache_responses,
+        user_seed=args.user_seed,
+    )
 
     try:
         # Execute the test flow
-        test_flow.register_user()
-        test_flow.login_user()
+        if args.no_token_cache or not test_flow.load_cached_token():
+            test_flow.sign_in()
+            test_flow.save_cached_token()
         test_flow.create_assistant()
         test_flow.update_assistant_settings()
-        widget_code = test_flow.get_widget_code()
+
+        # Widget code and settings are independent reads, so fetch them
+        # concurrently instead of paying for two sequential round-trips
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            widget_code_future = executor.submit(test_flow.get_widget_code)
+            settings_future = executor.submit(test_flow.get_widget_settings)
+            widget_code = widget_code_future.result()
+            settings = settings_future.result()
         print("Widget Code:", json.dumps(widget_code, indent=2))
-        settings = test_flow.get_widget_settings()
         print("Widget Settings:", json.dumps(settings, indent=2))
 
         print("\n=== Starting Conversation Test ===\n")
 
         # Test conversation with 5 back-and-forth exchanges
-        conversations: List[Dict[str, str]] = [
-            {
-                "user": (
-                    "Hello! I'm interested in learning about software testing "
-                    "best practices. Can you help me understand the key "
-                    "principles?"
-                ),
-                "context": "Initial question about testing principles",
-            },
-            {
-                "user": (
-                    "That's helpful! Could you elaborate specifically on the "
-                    "difference between unit tests and integration tests, and "
-                    "when to use each?"
-                ),
-                "context": "Follow-up on test types",
-            },
-            {
-                "user": (
-                    "Great explanation! Now, what are some popular Python "
-                    "testing frameworks you'd recommend, and what makes them "
-                    "stand out?"
-                ),
-                "context": "Question about testing tools",
-            },
-            {
-                "user": (
-                    "I've heard about test-driven development (TDD). Could you "
-                    "explain its benefits and potential drawbacks?"
-                ),
-                "context": "Exploring TDD methodology",
-            },
-            {
-                "user": (
-                    "Finally, can you provide some best practices for writing "
-                    "maintainable and readable test cases?"
-                ),
-                "context": "Best practices for test writing",
-            },
-        ]
-
-        for i, conv in enumerate(conversations, 1):
+        for i, conv in enumerate(CONVERSATIONS, 1):
             print(f"\n=== Exchange {i} ===")
-            print(f"\nContext: {conv['context']}")
-            print(f"\nUser: {conv['user']}")
+            print(f"\nContext: {conv.context}")
+            print(f"\nUser: {conv.user}")
 
-            response = test_flow.send_message(conv["user"])
+            response = test_flow.send_message(conv.user)
             if response:
                 print(f"\nAssistant: {response['content']}")
             else:
@@ -444,8 +636,10 @@ def main() -> None:
         
         # Get all messages first
         print("\nRetrieving all messages across sessions...")
-        all_messages = test_flow.get_all_messages()
-        print(f"\nFound {len(all_messages)} messages across all sessions")
+        # Messages come back newest first, so one page covering this run's
+        # exchanges (a user and an assistant message each) is all we inspect
+        all_messages = test_flow.get_all_messages(limit=2 * len(CONVERSATIONS))
+        print(f"\nFound {len(all_messages)} recent messages across all sessions")
         print("\nSample messages:")
         for msg in all_messages[:2]:  # Show first 2 messages
             print(f"- {msg['role']}: {msg['content'][:100]}...")
@@ -467,7 +661,7 @@ def main() -> None:
             
             # Verify deletion by trying to get messages again
             try:
-                test_flow.get_session_messages(session_id)
+                test_flow.get_session_messages(session_id, limit=1)
                 print("ERROR: Session still exists after deletion!")
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 404:
@@ -483,10 +677,10 @@ def main() -> None:
             print(f"\nFound {len(user_messages)} user messages")
             
             # Verify the last message matches our last conversation
-            if user_messages and conversations:
+            if user_messages and CONVERSATIONS:
                 last_user_msg = user_messages[0]  # Messages are in desc order
-                last_conv = conversations[-1]
-                if last_user_msg["content"] == last_conv["user"]:
+                last_conv = CONVERSATIONS[-1]
+                if last_user_msg["content"] == last_conv.user:
                     print("\n✓ Last message content verified")
                 else:
                     print("\n✗ Last message content mismatch")
@@ -9,131 +9,36 @@ This script performs end-to-end testing of the LOACL API Key management, includi
 
 import argparse
 import json
-import random
+import logging
+import os
 import sys
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, ClassVar, Dict, List, Optional
 
 import requests
+from flow_base import BaseTestFlow, configure_logging
 
+logger = logging.getLogger(__name__)
 
-class APIKeyTestFlow:
+
+class APIKeyTestFlow(BaseTestFlow):
     """Test class for validating the API Key management flow."""
 
-    def __init__(self, base_url: str):
+    EMAIL_PREFIX = "test"
+    TEST_PASSWORD = "testpass123"
+
+    # Constant request payload, built once and only ever read
+    API_KEY_DATA: ClassVar[Dict[str, Any]] = {"name": "Test API Key"}
+
+    def __init__(self, base_url: str, user_seed: Optional[str] = None):
         """Initialize the test flow.
 
         Args:
             base_url: Base URL of the API
+            user_seed: Fixed ID for the test user instead of a random one
         """
-        print("\nInitializing with:")
-        print(f"Base URL: {base_url}")
-
-        self.base_url = base_url.rstrip("/")
-        self.access_token: Optional[str] = None
-        self.headers: Dict[str, str] = {}
+        super().__init__(base_url, user_seed=user_seed)
         self.api_key_id: Optional[str] = None
-        self.api_key: Optional[str] = None
-
-        # Generate a random ID for the test user
-        self.random_id = random.randint(1000, 9999)
-        self.test_email = f"ashaheen+test+{self.random_id}@workhub.ai"
-        self.test_password = "testpass123"
-
-    def _make_request(
-        self,
-        method: str,
-        endpoint: str,
-        data: Optional[Dict[str, Any]] = None,
-        params: Optional[Dict[str, Any]] = None,
-        use_api_key: bool = False,
-    ) -> Dict[str, Any]:
-        """Make an HTTP request to the API.
-
-        Args:
-            method: HTTP method (GET, POST, etc.)
-            endpoint: API endpoint
-            data: Request data
-            params: Query parameters
-            use_api_key: Whether to use API key instead of Bearer token
-
-        Returns:
-            API response as dictionary
-        """
-        url = urljoin(self.base_url, endpoint)
-        headers = {}
-
-        # Use API key if specified and available
-        if use_api_key and self.api_key:
-            headers["X-API-Key"] = self.api_key
-        else:
-            headers = self.headers.copy()
-
-        if data and method != "GET":
-            # Sanitize data for logging
-            log_data = data.copy()
-            if "api_key" in log_data:
-                log_data["api_key"] = "***"
-            print(f"Request data: {json.dumps(log_data, indent=2)}")
-
-            headers["Content-Type"] = "application/json"
-            response = requests.request(
-                method, url, json=data, headers=headers, params=params
-            )
-        else:
-            response = requests.request(method, url, headers=headers, params=params)
-
-        try:
-            response.raise_for_status()
-            return response.json() if response.text else {}
-        except requests.exceptions.HTTPError as e:
-            print(f"\nError in {method} {endpoint}:")
-            print(f"Status code: {response.status_code}")
-            try:
-                error_data = response.json()
-                print(f"Error response: {json.dumps(error_data, indent=2)}")
-            except json.JSONDecodeError:
-                print(f"Raw error response: {response.text}")
-            raise e
-
-    def register_user(self) -> Dict[str, Any]:
-        """Register a new test user.
-
-        Returns:
-            Registration response
-        """
-        print("\n1. Registering user...")
-        data = {
-            "email": self.test_email,
-            "password": self.test_password,
-            "password_confirm": self.test_password,
-            "full_name": "Test User",
-        }
-        return self._make_request("POST", "/api/v1/auth/register", data)
-
-    def login_user(self) -> Dict[str, Any]:
-        """Log in the test user.
-
-        Returns:
-            Login response with access token
-        """
-        print("\n2. Logging in user...")
-        data = {
-            "grant_type": "password",
-            "username": self.test_email,
-            "password": self.test_password,
-        }
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        response = requests.post(
-            urljoin(self.base_url, "/api/v1/auth/login/access-token"),
-            data=data,
-            headers=headers,
-        )
-        response.raise_for_status()
-        response_data = response.json()
-        self.access_token = response_data["access_token"]
-        self.headers["Authorization"] = f"Bearer {self.access_token}"
-        return response_data
 
     def create_api_key(self) -> Dict[str, Any]:
         """Create a new API key.
@@ -141,12 +46,11 @@ class APIKeyTestFlow:
         Returns:
             API key creation response
         """
-        print("\n3. Creating API key...")
-        data = {"name": "Test API Key"}
-        response = self._make_request("POST", "/api/v1/api-keys", data)
+        logger.info("\n3. Creating API key...")
+        response = self._make_request("POST", "/api/v1/api-keys", self.API_KEY_DATA)
         self.api_key_id = response["id"]
         self.api_key = response["key"]
-        print(f"Created API key with ID: {self.api_key_id}")
+        logger.info("Created API key with ID: %s", self.api_key_id)
         return response
 
     def list_api_keys(self) -> List[Dict[str, Any]]:
@@ -155,7 +59,7 @@ class APIKeyTestFlow:
         Returns:
             List of API keys
         """
-        print("\n4. Listing API keys...")
+        logger.info("\n4. Listing API keys...")
         return self._make_request("GET", "/api/v1/api-keys")
 
     def get_api_key(self) -> Dict[str, Any]:
@@ -164,39 +68,39 @@ class APIKeyTestFlow:
         Returns:
             API key details
         """
-        print("\n5. Getting API key details...")
+        logger.info("\n5. Getting API key details...")
         return self._make_request("GET", f"/api/v1/api-keys/{self.api_key_id}")
 
     def delete_api_key(self) -> None:
         """Delete the created API key."""
-        print("\n6. Deleting API key...")
+        logger.info("\n6. Deleting API key...")
         self._make_request("DELETE", f"/api/v1/api-keys/{self.api_key_id}")
 
     def test_api_key_auth(self) -> None:
         """Test API key authentication."""
-        print("\n7. Testing API key authentication...")
+        logger.info("\n7. Testing API key authentication...")
         
         # Test accessing user profile with API key
-        print("Testing /api/v1/auth/me with API key...")
+        logger.info("Testing /api/v1/auth/me with API key...")
         user_profile = self._make_request("GET", "/api/v1/auth/me", use_api_key=True)
-        print("✓ Successfully accessed user profile with API key")
+        logger.info("✓ Successfully accessed user profile with API key")
         
         # Test accessing API keys list with API key
-        print("Testing /api/v1/api-keys with API key...")
+        logger.info("Testing /api/v1/api-keys with API key...")
         api_keys = self._make_request("GET", "/api/v1/api-keys", use_api_key=True)
-        print("✓ Successfully listed API keys with API key")
+        logger.info("✓ Successfully listed API keys with API key")
 
         # Test with invalid API key
-        print("Testing with invalid API key...")
+        logger.info("Testing with invalid API key...")
         original_api_key = self.api_key
         self.api_key = "invalid_key"
         try:
             self._make_request("GET", "/api/v1/auth/me", use_api_key=True)
-            print("ERROR: Request with invalid API key succeeded!")
+            logger.error("ERROR: Request with invalid API key succeeded!")
             sys.exit(1)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 401:
-                print("✓ Invalid API key correctly rejected")
+                logger.info("✓ Invalid API key correctly rejected")
             else:
                 raise
         finally:
@@ -209,29 +113,43 @@ def main() -> None:
     parser.add_argument(
         "--base-url", default="http://localhost:8000", help="Base URL of the API"
     )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Log request payloads (DEBUG level)"
+    )
+    parser.add_argument(
+        "--user-seed",
+        default=os.environ.get("CI_JOB_ID"),
+        help=(
+            "Fixed ID for the test user so runs reuse one account "
+            "(defaults to $CI_JOB_ID, otherwise a random ID)"
+        ),
+    )
     args = parser.parse_args()
 
-    test_flow = APIKeyTestFlow(args.base_url)
+    configure_logging(args.verbose)
+
+    test_flow = APIKeyTestFlow(args.base_url, user_seed=args.user_seed)
 
     try:
         # Execute the test flow
         print("\n=== Starting API Key Management Test ===\n")
 
         # User registration and authentication
-        test_flow.register_user()
-        test_flow.login_user()
+        test_flow.sign_in()
 
         # API key management
         created_key = test_flow.create_api_key()
         print("\nCreated API Key:")
         print(json.dumps(created_key, indent=2))
 
-        # List all keys
-        api_keys = test_flow.list_api_keys()
+        # Listing all keys and getting the new one are independent reads,
+        # so overlap their round-trips on the shared session
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            api_keys_future = executor.submit(test_flow.list_api_keys)
+            key_details_future = executor.submit(test_flow.get_api_key)
+            api_keys = api_keys_future.result()
+            key_details = key_details_future.result()
         print(f"\nFound {len(api_keys)} API key(s)")
-
-        # Get specific key
-        key_details = test_flow.get_api_key()
         print("\nAPI Key Details:")
         print(json.dumps(key_details, indent=2))
 
@@ -0,0 +1,141 @@
+from typing import Any, Dict, List, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.v1.endpoints import assistant_communication
+from app.main import app
+from app.schemas.user import User
+
+RUN_PATH = "/api/v1/assistant-communication/threads/thread_1/runs/run_1"
+MESSAGES_PATH = "/api/v1/assistant-communication/threads/thread_1/messages"
+
+
+class StubCommunicationService:
+    """Communication service returning a fixed run and message."""
+
+    def __init__(self) -> None:
+        self.message_calls: List[Dict[str, Any]] = []
+
+    def get_messages(
+        self, thread_id: str, limit: Optional[int] = None, order: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        self.message_calls.append(
+            {"thread_id": thread_id, "limit": limit, "order": order}
+        )
+        return [
+            {
+                "id": "msg_1",
+                "thread_id": thread_id,
+                "role": "assistant",
+                "content": [{"type": "text", "text": {"value": "Hi"}}],
+                "created_at": 1700000000,
+            }
+        ]
+
+    def get_run(self, thread_id: str, run_id: str) -> Dict[str, Any]:
+        return {
+            "id": run_id,
+            "thread_id": thread_id,
+            "assistant_id": "asst_1",
+            "status": "in_progress",
+            "created_at": 1700000000,
+        }
+
+
+@pytest.fixture
+def stub_service(monkeypatch):
+    """Serve runs and messages from a stub service for an authenticated user."""
+    service = StubCommunicationService()
+
+    async def get_assistant_service(assistant_id: str, current_user: User):
+        return service
+
+    monkeypatch.setattr(
+        assistant_communication, "get_assistant_service", get_assistant_service
+    )
+    app.dependency_overrides[deps.get_current_user] = lambda: User(
+        id="00000000-0000-0000-0000-000000000001", email="runs@example.com"
+    )
+    yield service
+    app.dependency_overrides.pop(deps.get_current_user, None)
+
+
+def test_run_status_etag(client: TestClient, stub_service):
+    """A run status carries an ETag and a matching If-None-Match gets a 304."""
+    params = {"assistant_id": "00000000-0000-0000-0000-000000000002"}
+    response = client.get(RUN_PATH, params=params)
+    assert response.status_code == 200
+    assert response.json()["status"] == "in_progress"
+    etag = response.headers["ETag"]
+
+    response = client.get(RUN_PATH, params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    ["W/{etag}", '"stale", {etag}', '"stale",W/{etag}', "*"],
+)
+def test_run_status_if_none_match_forms(
+    client: TestClient, stub_service, if_none_match: str
+):
+    """Weak, listed and wildcard If-None-Match values all match the run."""
+    params = {"assistant_id": "00000000-0000-0000-0000-000000000002"}
+    etag = client.get(RUN_PATH, params=params).headers["ETag"]
+
+    response = client.get(
+        RUN_PATH,
+        params=params,
+        headers={"If-None-Match": if_none_match.format(etag=etag)},
+    )
+    assert response.status_code == 304
+
+
+def test_run_status_stale_etag(client: TestClient, stub_service):
+    """A non-matching If-None-Match gets the full run."""
+    params = {"assistant_id": "00000000-0000-0000-0000-000000000002"}
+    response = client.get(
+        RUN_PATH, params=params, headers={"If-None-Match": 'W/"stale", "other"'}
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == "run_1"
+
+
+def test_list_messages_passes_limit_and_order(client: TestClient, stub_service):
+    """limit and order are handed to the service unchanged."""
+    params = {
+        "assistant_id": "00000000-0000-0000-0000-000000000002",
+        "limit": 5,
+        "order": "desc",
+    }
+    response = client.get(MESSAGES_PATH, params=params)
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == "msg_1"
+    assert stub_service.message_calls == [
+        {"thread_id": "thread_1", "limit": 5, "order": "desc"}
+    ]
+
+
+def test_list_messages_defaults(client: TestClient, stub_service):
+    """Without limit and order the service falls back to its defaults."""
+    params = {"assistant_id": "00000000-0000-0000-0000-000000000002"}
+    response = client.get(MESSAGES_PATH, params=params)
+    assert response.status_code == 200
+    assert stub_service.message_calls == [
+        {"thread_id": "thread_1", "limit": None, "order": None}
+    ]
+
+
+@pytest.mark.parametrize("query", [{"limit": 0}, {"order": "foo"}])
+def test_list_messages_rejects_invalid_query(
+    client: TestClient, stub_service, query: Dict[str, Any]
+):
+    """Out-of-range limits and unknown orders are rejected before the service."""
+    params = {"assistant_id": "00000000-0000-0000-0000-000000000002", **query}
+    response = client.get(MESSAGES_PATH, params=params)
+    assert response.status_code == 422
+    assert stub_service.message_calls == []
@@ -0,0 +1,100 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from app.api import deps
+from app.api.v1.endpoints import assistant_streaming
+from app.main import app
+from app.schemas.user import User
+
+STREAM_PATH = "/api/v1/assistant-streaming/threads/thread_1/runs/stream"
+
+
+class StubStreamingService:
+    """Streaming service that holds the stream open after its first event."""
+
+    def __init__(self) -> None:
+        self.released = asyncio.Event()
+        self.finished = False
+
+    async def stream_run(self, **kwargs: Any):
+        yield {"event": "thread.run.created", "data": "first"}
+        await self.released.wait()
+        yield {"event": "done", "data": "[DONE]"}
+        self.finished = True
+
+
+async def _stream_run(service: StubStreamingService) -> List[Dict[str, Any]]:
+    body = json.dumps({"assistant_id": "asst_1"}).encode()
+    sent: List[Dict[str, Any]] = []
+    request_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        sent.append(message)
+        if b"first" in message.get("body", b""):
+            # The first event reached the client while the generator is still
+            # suspended, so nothing in between buffered it
+            assert not service.finished
+            service.released.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": STREAM_PATH,
+        "raw_path": STREAM_PATH.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/json"),
+            (b"accept", b"text/event-stream"),
+            (b"accept-encoding", b"gzip, deflate"),
+        ],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    try:
+        await asyncio.wait_for(app(scope, receive, send), timeout=5)
+    finally:
+        disconnected.set()
+    return sent
+
+
+def test_stream_is_not_buffered_by_gzip(monkeypatch):
+    """SSE events are flushed one by one even when the client accepts gzip."""
+    service = StubStreamingService()
+
+    async def get_streaming_service(assistant_id: str, current_user: User):
+        return service
+
+    monkeypatch.setattr(
+        assistant_streaming, "get_streaming_service", get_streaming_service
+    )
+    app.dependency_overrides[deps.get_current_user] = lambda: User(
+        id="00000000-0000-0000-0000-000000000001", email="stream@example.com"
+    )
+    try:
+        sent = asyncio.run(_stream_run(service))
+    finally:
+        app.dependency_overrides.pop(deps.get_current_user, None)
+
+    start = sent[0]
+    headers = dict(start["headers"])
+    assert start["status"] == 200
+    assert b"content-encoding" not in headers
+    assert service.finished
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    assert b"data: first" in body
+    assert b"data: [DONE]" in body
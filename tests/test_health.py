@@ -1,14 +1,8 @@
 from fastapi.testclient import TestClient
 
-from app.main import app
 
-client = TestClient(app)
-
-def test_health_check():
+def test_health_check(client: TestClient):
     """Test the health check endpoint."""
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.json() == {
-        "status": "ok",
-        "message": "Service is running"
-    } 
\ No newline at end of file
+    assert response.json() == {"status": "ok", "message": "Service is running"}
@@ -9,21 +9,42 @@ This script performs end-to-end testing of the LOACL Streaming API, including:
 
 import argparse
 import asyncio
-import json
-import random
+import logging
+import secrets
 import sys
 import time
-from typing import Any, Dict, List, Optional, Union
-from urllib.parse import urljoin
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import aiohttp
-import requests
+from flow_base import (
+    JSON_HEADERS,
+    configure_logging,
+    dump_json,
+    format_json,
+    load_json,
+)
+
+logger = logging.getLogger(__name__)
+
+# Creates a thread and streams a run for its first message
+NEW_THREAD_STREAM_ENDPOINT = "/api/v1/assistant-streaming/threads/stream"
+
+# Bytes requested per read from an SSE response
+SSE_READ_SIZE = 16384
+
+# Seconds between terminal writes of buffered assistant deltas
+DELTA_FLUSH_INTERVAL = 0.05
 
 
 class StreamingAPITestFlow:
     """Test class for validating the LOACL Streaming API flow."""
 
-    def __init__(self, base_url: str, assistant_id: str, openai_key: str):
+    def __init__(
+        self,
+        base_url: str,
+        assistant_id: str,
+        openai_key: str,
+    ):
         """Initialize the test flow.
 
         Args:
@@ -31,10 +52,10 @@ class StreamingAPITestFlow:
             assistant_id: OpenAI Assistant ID
             openai_key: OpenAI API key
         """
-        print("\nInitializing with:")
-        print(f"Base URL: {base_url}")
-        print(f"Assistant ID: {assistant_id}")
-        print(f"OpenAI Key: {'*' * len(openai_key)}")
+        logger.info("\nInitializing with:")
+        logger.info("Base URL: %s", base_url)
+        logger.info("Assistant ID: %s", assistant_id)
+        logger.info("OpenAI Key: %s", "*" * len(openai_key))
 
         self.base_url = base_url.rstrip("/")
         self.openai_assistant_id = assistant_id
@@ -43,21 +64,38 @@ class StreamingAPITestFlow:
         self.api_key: Optional[str] = None
         self.local_assistant_id: Optional[str] = None
         self.thread_id: Optional[str] = None
+        # Request parts reused by every streamed message, see create_assistant
+        # and _on_thread_created
+        self._assistant_params: Dict[str, Any] = {}
+        self._run_data: Dict[str, Any] = {}
+        self._run_endpoint = ""
         self.headers: Dict[str, str] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Assistant deltas waiting to be written to stdout
+        self._out_buf: List[str] = []
+        self._last_flush = time.monotonic()
+        # SSE event type -> handler for its data payload
+        self._event_handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            "thread.created": self._on_thread_created,
+            "thread.message.delta": self._on_message_delta,
+            "thread.message.completed": self._on_message_completed,
+            "error": self._on_error,
+        }
 
-        # Generate a random ID for the test user
-        self.random_id = random.randint(1000, 9999)
+        # Generate a random ID for the test user from os.urandom, which
+        # doesn't share the random module's global generator
+        self.random_id = secrets.token_hex(6)
         self.test_email = f"ashaheen+loacl+{self.random_id}@workhub.ai"
         self.test_password = "uraan123"
 
-    def _make_request(
+    async def _make_request(
         self,
         method: str,
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
         use_api_key: bool = False,
-    ) -> Dict[str, Any]:
+    ) -> Any:
         """Make an HTTP request to the API.
 
         Args:
@@ -70,41 +108,167 @@ class StreamingAPITestFlow:
         Returns:
             API response as dictionary
         """
-        url = urljoin(self.base_url, endpoint)
-        headers = {}
+        # base_url has no trailing slash and every endpoint starts with "/"
+        url = f"{self.base_url}{endpoint}"
 
         # Use API key if specified and available
         if use_api_key and self.api_key:
-            headers["X-API-Key"] = self.api_key
+            headers = {"X-API-Key": self.api_key}
         else:
-            headers = self.headers.copy()
+            headers = self.headers
 
+        body: Optional[bytes] = None
         if data and method != "GET":
-            # Sanitize data for logging
-            log_data = data.copy()
-            if "api_key" in log_data:
-                log_data["api_key"] = "***"
-            print(f"Request data: {json.dumps(log_data, indent=2)}")
-
-            headers["Content-Type"] = "application/json"
-            response = requests.request(
-                method, url, json=data, headers=headers, params=params
+            if logger.isEnabledFor(logging.DEBUG):
+                # Sanitize data for logging, copying only when there's a secret
+                log_data = {**data, "api_key": "***"} if "api_key" in data else data
+                logger.debug("Request data: %s", format_json(log_data))
+
+            # Serialize once ourselves rather than via aiohttp's json.dumps
+            body = dump_json(data)
+            headers = {**headers, **JSON_HEADERS}
+
+        async with self._get_session().request(
+            method, url, data=body, headers=headers, params=params
+        ) as response:
+            content = await response.read()
+            if response.status >= 400:
+                logger.error("\nError in %s %s:", method, endpoint)
+                logger.error("Status code: %s", response.status)
+                try:
+                    error_data = load_json(content)
+                    logger.error("Error response: %s", format_json(error_data))
+                except ValueError:
+                    logger.error(
+                        "Raw error response: %s", content.decode(errors="replace")
+                    )
+                response.raise_for_status()
+            return load_json(content) if content else {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the client session shared by every request in the flow.
+
+        Returns:
+            Client session over a keep-alive pool with DNS caching enabled
+        """
+        if self._session is None or self._session.closed:
+            try:
+                # Non-blocking DNS; requires aiodns (aiohttp[speedups])
+                resolver: Optional[aiohttp.AsyncResolver] = aiohttp.AsyncResolver()
+            except RuntimeError:
+                resolver = None
+            connector = aiohttp.TCPConnector(
+                resolver=resolver,
+                ttl_dns_cache=300,
+                limit=20,
+                keepalive_timeout=60,
             )
-        else:
-            response = requests.request(method, url, headers=headers, params=params)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
 
-        try:
-            response.raise_for_status()
-            return response.json() if response.text else {}
-        except requests.exceptions.HTTPError as e:
-            print(f"\nError in {method} {endpoint}:")
-            print(f"Status code: {response.status_code}")
+    async def close(self) -> None:
+        """Close the shared client session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _write_delta(self, text: str) -> None:
+        """Buffer an assistant delta, writing to stdout at most every interval.
+
+        Args:
+            text: Delta text to output
+        """
+        self._out_buf.append(text)
+        if time.monotonic() - self._last_flush > DELTA_FLUSH_INTERVAL:
+            self._flush_output()
+
+    def _flush_output(self) -> None:
+        """Write any buffered assistant deltas to stdout."""
+        if self._out_buf:
+            sys.stdout.write("".join(self._out_buf))
+            sys.stdout.flush()
+            self._out_buf.clear()
+        self._last_flush = time.monotonic()
+
+    def _on_thread_created(self, event_data: Dict[str, Any]) -> None:
+        """Remember the ID of a thread created by the stream.
+
+        Args:
+            event_data: Thread object
+        """
+        if "id" in event_data:
+            self.thread_id = event_data["id"]
+            self._run_endpoint = (
+                f"/api/v1/assistant-streaming/threads/{self.thread_id}/runs/stream"
+            )
+            logger.info("\nThread created: %s", self.thread_id)
+
+    def _on_message_delta(self, event_data: Dict[str, Any]) -> None:
+        """Output the text parts of a message delta.
+
+        Args:
+            event_data: Message delta object
+        """
+        for part in event_data.get("delta", {}).get("content", []):
+            if part.get("type") == "text":
+                self._write_delta(part["text"]["value"])
+
+    def _on_message_completed(self, event_data: Dict[str, Any]) -> None:
+        """Finish the output of a completed message.
+
+        Args:
+            event_data: Completed message object
+        """
+        self._flush_output()
+        logger.info("\nMessage completed")
+
+    def _on_error(self, event_data: Dict[str, Any]) -> None:
+        """Report an error sent by the stream.
+
+        Args:
+            event_data: Error payload
+        """
+        self._flush_output()
+        logger.error("\nError: %s", event_data.get("error"))
+
+    def _process_sse_line(
+        self, raw: bytearray, event_type: Optional[str]
+    ) -> Optional[str]:
+        """Handle one line of an SSE stream.
+
+        Args:
+            raw: Line including its trailing newline
+            event_type: Type of the event the line belongs to
+
+        Returns:
+            Event type for the following lines
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Raw line received: %r", bytes(raw))
+
+        # Only "event: " and "data: " lines matter; compare byte slices and
+        # leave the payload undecoded, since load_json accepts bytes (and
+        # trailing CR/LF)
+        if raw[:7] == b"event: ":
+            return raw[7:].rstrip().decode("ascii")
+
+        if raw[:6] == b"data: ":
+            payload = raw[6:]
             try:
-                error_data = response.json()
-                print(f"Error response: {json.dumps(error_data, indent=2)}")
-            except json.JSONDecodeError:
-                print(f"Raw error response: {response.text}")
-            raise e
+                event_data = load_json(payload)
+            except ValueError as e:
+                logger.error("\nError parsing event data: %s", e)
+                logger.error("Raw event data: %r", bytes(payload))
+                return event_type
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\nParsed event data: %s", format_json(event_data))
+
+            handler = self._event_handlers.get(event_type)
+            if handler is not None and isinstance(event_data, dict):
+                handler(event_data)
+
+        return event_type
 
     async def _stream_request(
         self,
@@ -121,7 +285,8 @@ class StreamingAPITestFlow:
             params: Query parameters
             use_api_key: Whether to use API key instead of Bearer token
         """
-        url = urljoin(self.base_url, endpoint)
+        # base_url has no trailing slash and every endpoint starts with "/"
+        url = f"{self.base_url}{endpoint}"
         headers = {}
         
         # Use API key if specified and available
@@ -132,134 +297,112 @@ class StreamingAPITestFlow:
             
         headers["Content-Type"] = "application/json"
         headers["Accept"] = "text/event-stream"
+        headers["Accept-Encoding"] = "identity"
 
-        print(f"\nMaking streaming request to: {url}")
-        print("Headers:", json.dumps(headers, indent=2))
-        print("Data:", json.dumps(data, indent=2))
-        if params:
-            print("Params:", json.dumps(params, indent=2))
+        logger.info("\nMaking streaming request to: %s", url)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Headers: %s", format_json(headers))
+            logger.debug("Data: %s", format_json(data))
+            if params:
+                logger.debug("Params: %s", format_json(params))
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url, json=data, params=params, headers=headers
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        print(f"\nError response status: {response.status}")
-                        print(f"Error response headers: {response.headers}")
-                        print(f"Error text: {error_text}")
-                        return
-
-                    print("\nStreaming response started...")
-                    print(f"Response headers: {response.headers}")
-
-                    event_type = None
-                    async for line in response.content:
+            async with self._get_session().post(
+                url, data=dump_json(data), params=params, headers=headers
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error("\nError response status: %s", response.status)
+                    logger.error("Error response headers: %s", response.headers)
+                    logger.error("Error text: %s", error_text)
+                    return
+
+                logger.info("\nStreaming response started...")
+                logger.debug("Response headers: %s", response.headers)
+
+                # Read whole network chunks into one reusable buffer and
+                # split lines out of it, rather than awaiting once per line
+                buf = bytearray()
+                event_type: Optional[str] = None
+                while True:
+                    chunk = await response.content.read(SSE_READ_SIZE)
+                    if not chunk:
+                        break
+                    buf.extend(chunk)
+                    start = 0
+                    while True:
+                        end = buf.find(b"\n", start)
+                        if end < 0:
+                            break
                         try:
-                            line = line.decode("utf-8")
-                            print(f"Raw line received: {line!r}")
-
-                            if not line.strip():
-                                continue
-
-                            if line.startswith("event: "):
-                                event_type = line[7:].strip()
-                                continue
-
-                            if line.startswith("data: "):
-                                try:
-                                    event_data = json.loads(line[6:])
-                                    print(
-                                        f"\nParsed event data: {json.dumps(event_data, indent=2)}"
-                                    )
-
-                                    if isinstance(event_data, dict):
-                                        if (
-                                            event_type == "thread.created"
-                                            and "id" in event_data
-                                        ):
-                                            self.thread_id = event_data["id"]
-                                            print(f"\nThread created: {self.thread_id}")
-                                        elif event_type == "thread.message.delta":
-                                            delta = event_data.get("delta", {})
-                                            content = delta.get("content", [])
-                                            for part in content:
-                                                if part.get("type") == "text":
-                                                    print(
-                                                        part["text"]["value"],
-                                                        end="",
-                                                        flush=True,
-                                                    )
-                                        elif event_type == "thread.message.completed":
-                                            print("\nMessage completed")
-                                        elif event_type == "error":
-                                            print(f"\nError: {event_data.get('error')}")
-                                except json.JSONDecodeError as e:
-                                    print(f"\nError parsing event data: {e}")
-                                    print(f"Raw event data: {line[6:]}")
-
+                            event_type = self._process_sse_line(
+                                buf[start : end + 1], event_type
+                            )
                         except Exception as e:
-                            print(f"\nError processing line: {e}")
-                            continue
+                            logger.error("\nError processing line: %s", e)
+                        start = end + 1
+                    # Keep only the trailing partial line
+                    del buf[:start]
+
+                # Don't leave the tail of an unfinished message buffered
+                self._flush_output()
 
         except Exception as e:
-            print(f"\nError in streaming request: {e}")
+            logger.error("\nError in streaming request: %s", e)
             raise
 
-    def register_user(self) -> Dict[str, Any]:
+    async def register_user(self) -> Dict[str, Any]:
         """Register a new test user.
 
         Returns:
             Registration response
         """
-        print("\n1. Registering user...")
+        logger.info("\n1. Registering user...")
         data = {
             "email": self.test_email,
             "password": self.test_password,
             "full_name": "Test User",
         }
-        return self._make_request("POST", "/api/v1/auth/register", data)
+        return await self._make_request("POST", "/api/v1/auth/register", data)
 
-    def login_user(self) -> Dict[str, Any]:
+    async def login_user(self) -> Dict[str, Any]:
         """Log in the test user.
 
         Returns:
             Login response with access token
         """
-        print("\n2. Logging in user...")
+        logger.info("\n2. Logging in user...")
         data = {
             "grant_type": "password",
             "username": self.test_email,
             "password": self.test_password,
         }
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        response = requests.post(
-            urljoin(self.base_url, "/api/v1/auth/login/access-token"),
-            data=data,
-            headers=headers,
-        )
-        response.raise_for_status()
-        response_data = response.json()
+        # aiohttp form-encodes a dict body
+        async with self._get_session().post(
+            f"{self.base_url}/api/v1/auth/login/access-token", data=data
+        ) as response:
+            response.raise_for_status()
+            response_data = load_json(await response.read())
         self.access_token = response_data["access_token"]
         self.headers["Authorization"] = f"Bearer {self.access_token}"
         return response_data
 
-    def create_assistant(self) -> Dict[str, Any]:
+    async def create_assistant(self) -> Dict[str, Any]:
         """Create a new assistant.
 
         Returns:
             Assistant creation response
         """
-        print("\n3. Creating assistant...")
+        logger.info("\n3. Creating assistant...")
         if not self.openai_assistant_id.startswith("asst_"):
             raise ValueError(
                 f"Invalid assistant ID format. Got '{self.openai_assistant_id}' "
                 "but it must start with 'asst_'"
             )
 
-        print(
-            f"Creating assistant with OpenAI Assistant ID: {self.openai_assistant_id}"
+        logger.info(
+            "Creating assistant with OpenAI Assistant ID: %s",
+            self.openai_assistant_id,
         )
         data = {
             "name": "Test Assistant",
@@ -270,51 +413,65 @@ class StreamingAPITestFlow:
             "assistant_id": self.openai_assistant_id,
             "tools_enabled": ["code_interpreter"],
         }
-        response = self._make_request("POST", "/api/v1/assistants", data)
+        response = await self._make_request("POST", "/api/v1/assistants", data)
         self.local_assistant_id = response["id"]
-        print(f"Created local assistant with ID: {self.local_assistant_id}")
+        # Only ever read, so build the per-message request parts once
+        self._assistant_params = {"assistant_id": self.local_assistant_id}
+        self._run_data = {
+            "assistant_id": self.local_assistant_id,
+            "instructions": None,
+            "tools": [],
+        }
+        logger.info("Created local assistant with ID: %s", self.local_assistant_id)
         return response
 
-    def create_api_key(self) -> Dict[str, Any]:
+    async def create_api_key(self) -> Dict[str, Any]:
         """Create a new API key.
 
         Returns:
             API key creation response
         """
-        print("\n3. Creating API key...")
+        logger.info("\n3. Creating API key...")
         data = {"name": "Test API Key"}
-        response = self._make_request("POST", "/api/v1/api-keys", data)
+        response = await self._make_request("POST", "/api/v1/api-keys", data)
         self.api_key = response["key"]
-        print(f"Created API key: {self.api_key}")
+        logger.info("Created API key: %s", self.api_key)
         return response
 
-    async def send_streaming_message(self, message: str) -> None:
-        """Send a message using streaming API.
+    def _next_stream_request(
+        self, message: str
+    ) -> Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Get the streaming call that sends the next message.
 
         Args:
             message: Message content to send
-        """
-        print(f"\nSending message: {message}")
 
+        Returns:
+            Endpoint, request data and query parameters
+        """
         # Create thread and run if needed
         if not self.thread_id:
             message_data = {"role": "user", "content": message, "file_ids": []}
             data = {"messages": [message_data]}
-            print("\nCreating new thread with data:", json.dumps(data, indent=2))
-            endpoint = f"/api/v1/assistant-streaming/threads/stream"
-            params = {"assistant_id": self.local_assistant_id}
-        else:
-            data = {
-                "assistant_id": self.local_assistant_id,
-                "instructions": None,
-                "tools": [],
-            }
-            print("\nContinuing thread with data:", json.dumps(data, indent=2))
-            endpoint = (
-                f"/api/v1/assistant-streaming/threads/{self.thread_id}/runs/stream"
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\nCreating new thread with data: %s", format_json(data))
+            return NEW_THREAD_STREAM_ENDPOINT, data, self._assistant_params
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "\nContinuing thread with data: %s", format_json(self._run_data)
             )
-            params = None
+        return self._run_endpoint, self._run_data, None
+
+    async def send_streaming_message(self, message: str) -> None:
+        """Send a message using streaming API.
 
+        Args:
+            message: Message content to send
+        """
+        logger.info("\nSending message: %s", message)
+
+        endpoint, data, params = self._next_stream_request(message)
         await self._stream_request(endpoint, data, params)
 
     async def send_streaming_message_with_api_key(self, message: str) -> None:
@@ -323,39 +480,21 @@ class StreamingAPITestFlow:
         Args:
             message: Message content to send
         """
-        print(f"\nSending message with API key: {message}")
-
-        # Create thread and run if needed
-        if not self.thread_id:
-            message_data = {"role": "user", "content": message, "file_ids": []}
-            data = {"messages": [message_data]}
-            print("\nCreating new thread with data:", json.dumps(data, indent=2))
-            endpoint = f"/api/v1/assistant-streaming/threads/stream"
-            params = {"assistant_id": self.local_assistant_id}
-        else:
-            data = {
-                "assistant_id": self.local_assistant_id,
-                "instructions": None,
-                "tools": [],
-            }
-            print("\nContinuing thread with data:", json.dumps(data, indent=2))
-            endpoint = (
-                f"/api/v1/assistant-streaming/threads/{self.thread_id}/runs/stream"
-            )
-            params = None
+        logger.info("\nSending message with API key: %s", message)
 
+        endpoint, data, params = self._next_stream_request(message)
         await self._stream_request(endpoint, data, params, use_api_key=True)
 
-    def delete_chat_session(self, use_api_key: bool = False) -> None:
+    async def delete_chat_session(self, use_api_key: bool = False) -> None:
         """Delete the current chat session.
         
         Args:
             use_api_key: Whether to use API key authentication
         """
         if self.thread_id:
-            print("\nDeleting chat session...")
+            logger.info("\nDeleting chat session...")
             # Get the session ID from the thread ID
-            session_result = self._make_request(
+            session_result = await self._make_request(
                 "GET",
                 "/api/v1/assistant-communication/chat-sessions/messages",
                 params={"assistant_id": self.local_assistant_id},
@@ -365,19 +504,19 @@ class StreamingAPITestFlow:
             if session_result and len(session_result) > 0:
                 session_id = session_result[0]["session_id"]
                 try:
-                    self._make_request(
+                    await self._make_request(
                         "DELETE",
                         f"/api/v1/assistant-communication/chat-sessions/{session_id}",
                         params={"assistant_id": self.local_assistant_id},
                         use_api_key=use_api_key
                     )
-                    print("Chat session deleted successfully")
+                    logger.info("Chat session deleted successfully")
                 except Exception as e:
-                    print(f"Error deleting chat session: {e}")
+                    logger.error("Error deleting chat session: %s", e)
             else:
-                print("No chat session found to delete")
+                logger.info("No chat session found to delete")
 
-    def delete_assistant(self, use_api_key: bool = False) -> Dict[str, Any]:
+    async def delete_assistant(self, use_api_key: bool = False) -> Dict[str, Any]:
         """Delete the test assistant.
         
         Args:
@@ -386,8 +525,8 @@ class StreamingAPITestFlow:
         Returns:
             Deletion response
         """
-        print("\n9. Deleting assistant...")
-        return self._make_request(
+        logger.info("\n9. Deleting assistant...")
+        return await self._make_request(
             "DELETE", 
             f"/api/v1/assistants/{self.local_assistant_id}",
             use_api_key=use_api_key
@@ -402,15 +541,21 @@ async def main() -> None:
     )
     parser.add_argument("--assistant-id", required=True, help="OpenAI Assistant ID")
     parser.add_argument("--openai-key", required=True, help="OpenAI API Key")
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log request payloads and raw SSE events (DEBUG level)",
+    )
     args = parser.parse_args()
+    configure_logging(args.verbose)
 
     test_flow = StreamingAPITestFlow(args.base_url, args.assistant_id, args.openai_key)
 
     try:
         # Execute the test flow
-        test_flow.register_user()
-        test_flow.login_user()
-        test_flow.create_assistant()
+        await test_flow.register_user()
+        await test_flow.login_user()
+        await test_flow.create_assistant()
 
         print("\n=== Starting Token-based Streaming Conversation Test ===\n")
 
@@ -452,11 +597,11 @@ async def main() -> None:
 
         # Clean up the thread and reset for API key test
         if test_flow.thread_id:
-            test_flow.delete_chat_session(use_api_key=False)  # Use token auth for cleanup
+            await test_flow.delete_chat_session(use_api_key=False)  # Use token auth for cleanup
         test_flow.thread_id = None
 
         # Create API key and test streaming with it
-        test_flow.create_api_key()
+        await test_flow.create_api_key()
         print("\n=== Starting API Key-based Streaming Conversation Test ===\n")
 
         for i, conv in enumerate(conversations, 1):
@@ -470,14 +615,23 @@ async def main() -> None:
         # Cleanup using API key auth
         print("\n=== Cleanup ===")
         if test_flow.thread_id:
-            test_flow.delete_chat_session(use_api_key=True)  # Use API key auth for cleanup
-        test_flow.delete_assistant(use_api_key=True)  # Use API key auth for cleanup
+            await test_flow.delete_chat_session(use_api_key=True)  # Use API key auth for cleanup
+        await test_flow.delete_assistant(use_api_key=True)  # Use API key auth for cleanup
         print("\nTest flow completed successfully!")
 
     except Exception as e:
         print(f"\nError during test flow: {str(e)}")
         sys.exit(1)
+    finally:
+        await test_flow.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        # libuv-based event loop, noticeably cheaper per await than asyncio's;
+        # uvloop.run replaces uvloop.install, deprecated on Python 3.12+
+        from uvloop import run
+    except ImportError:
+        # No uvloop, or one older than 0.18 without uvloop.run
+        from asyncio import run
+    run(main())